@@ -1,3 +1,20 @@
+import argparse
+import contextlib
+import cProfile
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import pstats
+import re
+import select
+import struct
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 text = """
   "action_jester_desc": "Wähle eine der drei Karten, um deine Gaukler-Rolle für diese Nacht damit zu tauschen. 🤡🎴🌙",
   "action_love_btn": "Zur Handlung 💘",
@@ -315,26 +332,804 @@ text = """
   "with_narrator": "Mit Erzähler spielen 🎙️",
   "without_narrator": "Ohne Erzähler spielen 🚫🎙️"
 """
+# Reihenfolge und Kopfzeile von src/i18n.ts (LANGUAGES)
+LANGUAGES = [
+    ("de", "Deutsch", "🇩🇪"),
+    ("en", "English", "🇬🇧"),
+    ("fr", "Français", "🇫🇷"),
+    ("es", "Español", "🇪🇸"),
+    ("pt", "Português", "🇵🇹"),
+    ("it", "Italiano", "🇮🇹"),
+    ("ru", "Русский", "🇷🇺"),
+    ("is", "Íslenska", "🇮🇸"),
+    ("sv", "Svenska", "🇸🇪"),
+    ("zh-CN", "中文", "🇨🇳"),
+    ("ja", "日本語", "🇯🇵"),
+    ("tr", "Türkçe", "🇹🇷"),
+    ("ar", "العربية", "🇸🇦"),
+    ("ko", "한국어", "🇰🇷"),
+    ("hi", "हिन्दी", "🇮🇳"),
+    ("bn", "বাংলা", "🇧🇩"),
+    ("pl", "Polski", "🇵🇱"),
+    ("da", "Dansk", "🇩🇰"),
+    ("cs", "Čeština", "🇨🇿"),
+    ("fi", "Suomi", "🇫🇮"),
+    ("no", "Norsk", "🇳🇴"),
+    ("hu", "Magyar", "🇭🇺"),
+    ("nl", "Nederlands", "🇳🇱"),
+    ("ro", "Română", "🇷🇴"),
+    ("he", "עברית", "🇮🇱"),
+    ("emoji", "Emoji", "🎭"),
+]
+
+# Schlüssel im translations-Objekt, falls abweichend vom LANGUAGES-Code
+LOCALE_KEYS = {"zh-CN": "zh"}
+
+SOURCE_EXTENSIONS = (".json", ".txt")
+
+# Schlüsselsuche für --prune
+SCAN_EXTENSIONS = (".ts", ".tsx")
+KEY_CHARS = re.compile(r"[A-Za-z0-9_]*")
+KEY_LITERAL = re.compile(r"'([A-Za-z0-9_]+)'|\"([A-Za-z0-9_]+)\"")
+TEMPLATE_LITERAL = re.compile(r"`([^`]*)`")
+TEMPLATE_EXPR = re.compile(r"\$\{[^}]*\}")
+PLACEHOLDER = re.compile(r"\{([^{}\s]+)\}")
+# --indexed: Zeile der KEY_IDS-Tabelle, entfernte Schlüssel stehen dort auskommentiert
+KEY_ID_LINE = re.compile(r"\s*(?:// )?([^\s:]+): (\d+),")
+
+# Cache der gerenderten Blöcke; CACHE_VERSION erhöhen, wenn sich das Ausgabeformat ändert
+DEFAULT_CACHE_DIR = ".k_cache"
+CACHE_INDEX = "hashes.json"
+CACHE_VERSION = "2"
+REFERENCE_LOCALE = "de"
+
+# Wird von t() in LanguageContext.tsx per Schlüssel gelesen, darf also nicht --indexed sein
+APP_CATALOG = "src/i18n.ts"
+
+# --watch: Wartezeit nach der letzten Änderung und Intervall für den Polling-Fallback (Sekunden)
+WATCH_DEBOUNCE = 0.03
+POLL_INTERVAL = 0.05
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+
+# --profile: Anzahl der ausgegebenen Funktionen
+PROFILE_LINES = 25
+
+
+def locale_key(code):
+    return LOCALE_KEYS.get(code, code)
+
+
+def parse_line(line):
+    # Liefert (key, value) oder None für Leer-, Kommentar- und Klammerzeilen
+    line = line.strip()
+    if not line or line.startswith("//"):
+        return None
+    if ":" not in line:
+        return None
+    key, value = line.split(":", 1)
+    key = key.strip().strip('"')  # Key ohne Anführungszeichen
+    value = value.strip()          # Value bleibt mit Anführungszeichen
+    return key, value
+
+
 def format_text_and_save(text, output_file):
-    lines = text.splitlines()
     formatted_lines = []
 
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("//"):
-            continue
-        if ":" in line:
-            key, value = line.split(":", 1)
-            key = key.strip().strip('"')  # Key ohne Anführungszeichen
-            value = value.strip()          # Value bleibt mit Anführungszeichen
-            formatted_line = f'    {key}: {value}'  # Vier Leerzeichen vor jeder Zeile
-            formatted_lines.append(formatted_line)
+    for line in text.splitlines():
+        entry = parse_line(line)
+        if entry:
+            key, value = entry
+            formatted_lines.append(f'    {key}: {value}')  # Vier Leerzeichen vor jeder Zeile
 
     with open(output_file, "w", encoding="utf-8") as f:
         f.write("\n".join(formatted_lines))
 
     print(f"Datei '{output_file}' erstellt!")
 
+
+def find_source(src_dir, locale):
+    for ext in SOURCE_EXTENSIONS:
+        path = os.path.join(src_dir, locale + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def render_block(locale, source_path, out, usage=None, ref_keys=frozenset()):
+    # Liest die Quelldatei Zeile für Zeile und schreibt den fertigen Block direkt nach out.
+    # Liefert die Platzhalter-Signatur: Platzhalter je Schlüssel mit "{" oder aus ref_keys
+    signature = {}
+    out.write(f"  {locale}: {{\n")
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            entry = parse_line(line)
+            if entry:
+                key, value = entry
+                if usage and not is_used(key, usage):
+                    continue
+                value = value.rstrip(",")
+                if key in ref_keys or "{" in value:
+                    signature[key] = placeholders(value)
+                out.write(f"    {key}: {value},\n")
+    out.write("  },\n")
+    return signature
+
+
+def render_block_file(job):
+    locale, source_path, part_path, usage, ref_keys = job
+    signature = {}
+    # Atomar, damit ein Abbruch keinen halben Block hinterlässt, der zum alten Hash passt
+    atomic_write(part_path, lambda out: signature.update(render_block(locale, source_path, out, usage, ref_keys)))
+    return signature
+
+
+def block_signature(part_path, ref_keys):
+    # Signatur aus einem vorhandenen Block, falls sich nur die Referenz 'de' geändert hat
+    signature = {}
+    with open(part_path, encoding="utf-8") as f:
+        for line in f:
+            entry = parse_line(line)
+            if entry and entry[1].endswith(","):
+                key, value = entry[0], entry[1].rstrip(",")
+                if key in ref_keys or "{" in value:
+                    signature[key] = placeholders(value)
+    return signature
+
+
+def scan_key_usage(scan_dir, exclude=()):
+    # Sammelt alle Schlüssel-Literale aus src/**/*.ts(x); Template-Strings wie
+    # `narrator_${role}_open` werden zu Wildcards (narrator_*_open)
+    exclude = {os.path.abspath(path) for path in exclude}
+    literals = set()
+    patterns = set()
+    for root, dirs, files in os.walk(scan_dir):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in exclude]
+        for name in files:
+            path = os.path.join(root, name)
+            if not name.endswith(SCAN_EXTENSIONS) or os.path.abspath(path) in exclude:
+                continue
+            with open(path, encoding="utf-8") as f:
+                code = f.read()
+            literals.update(a or b for a, b in KEY_LITERAL.findall(code))
+            for template in TEMPLATE_LITERAL.findall(code):
+                static = TEMPLATE_EXPR.split(template)
+                if len(static) > 1 and any(static) and all(KEY_CHARS.fullmatch(s) for s in static):
+                    patterns.add("[A-Za-z0-9_]*".join(re.escape(s) for s in static))
+    pattern = re.compile("|".join(sorted(patterns))) if patterns else None
+    return frozenset(literals), pattern
+
+
+def is_used(key, usage):
+    literals, pattern = usage
+    return key in literals or bool(pattern and pattern.fullmatch(key))
+
+
+def usage_fingerprint(usage):
+    literals, pattern = usage
+    h = hashlib.sha256("\n".join(sorted(literals)).encode())
+    h.update(pattern.pattern.encode() if pattern else b"")
+    return h.hexdigest()
+
+
+def source_keys(source_path):
+    with open(source_path, encoding="utf-8") as f:
+        return [entry[0] for entry in map(parse_line, f) if entry]
+
+
+def report_pruned(sources, usage):
+    # Bericht anhand der Referenzsprache 'de' plus Schlüssel, die nur in anderen Sprachen vorkommen
+    pruned = set()
+    for path in sources.values():
+        pruned.update(key for key in source_keys(path) if not is_used(key, usage))
+    if pruned:
+        print(f"{len(pruned)} unbenutzte Schlüssel entfernt:")
+        for key in sorted(pruned):
+            print(f"  - {key}")
+    else:
+        print("Keine unbenutzten Schlüssel gefunden.")
+
+
+def render_header():
+    lines = [f"  {{ code: '{code}', name: '{name}', flag: '{flag}' }}" for code, name, flag in LANGUAGES]
+    return "export const LANGUAGES = [\n" + ",\n".join(lines) + "\n];\n\n"
+
+
+def file_mode(path):
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(output_file, write):
+    # Schreibt in eine temporäre Datei im Zielordner und ersetzt das Ziel erst am Ende
+    directory = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".K-", suffix=".tmp")
+    try:
+        # mkstemp legt 0600 an; Rechte des Ziels bzw. den umask-Standard übernehmen
+        os.chmod(tmp_path, file_mode(output_file))
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as out:
+            write(out)
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_hash(path, salt=""):
+    h = hashlib.sha256((CACHE_VERSION + salt).encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_cache(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, CACHE_INDEX), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_dir, hashes):
+    atomic_write(os.path.join(cache_dir, CACHE_INDEX),
+                 lambda out: json.dump(hashes, out, indent=2, sort_keys=True))
+
+
+def render_changed(work, jobs):
+    # Wenige Sprachen direkt rendern, der Prozesspool lohnt sich erst ab mehreren
+    if len(work) <= 2 or jobs == 1:
+        return [render_block_file(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(render_block_file, work))
+
+
+def cache_entry(cached, locale):
+    # Einträge älterer Cache-Versionen (nur der Hash als String) zählen als fehlend
+    entry = cached.get(locale)
+    return entry if isinstance(entry, dict) else {}
+
+
+def ref_fingerprint(ref_keys):
+    return hashlib.sha256("\n".join(sorted(ref_keys)).encode()).hexdigest()
+
+
+def write_chunks_if_changed(output_file, chunks):
+    # chunks() liefert den Inhalt stückweise; verglichen wird per Hash, ohne die Ausgabe im Speicher zu halten.
+    # Gibt False zurück, wenn die Zieldatei bereits byte-identisch ist
+    new = hashlib.sha256()
+    for chunk in chunks():
+        new.update(chunk.encode("utf-8"))
+    try:
+        old = hashlib.sha256()
+        with open(output_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                old.update(block)
+        if old.digest() == new.digest():
+            return False
+    except OSError:
+        pass
+    atomic_write(output_file, lambda out: out.writelines(chunks()))
+    return True
+
+
+def write_if_changed(output_file, content):
+    return write_chunks_if_changed(output_file, lambda: [content])
+
+
+def block_chunks(part_path):
+    with open(part_path, encoding="utf-8") as f:
+        yield from iter(lambda: f.read(1 << 16), "")
+
+
+# Stufen für --stats: hashen (Quellen hashen, --prune-Scan), rendern (Quellen lesen und Zeilen parsen,
+# ggf. im Pool), platzhalter, zusammensetzen (nur --templates/--intern/--indexed) und schreiben
+# (Vergleich mit der Zieldatei; im Standardmodus werden die Blöcke erst hier durchgereicht)
+@contextlib.contextmanager
+def stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def generate_all(src_dir, output_file, jobs=None, cache_dir=DEFAULT_CACHE_DIR, split_dir=None, prune_dir=None,
+                 intern=False, templates=False, strict=False, indexed=False, stats=False):
+    timings = {}
+    locales = [locale_key(code) for code, _, _ in LANGUAGES]
+    sources = {locale: find_source(src_dir, locale) for locale in locales}
+    missing = [locale for locale, path in sources.items() if not path]
+    if missing:
+        sys.exit(f"Fehlende Quelldateien in '{src_dir}': {', '.join(missing)}")
+
+    with stage(timings, "hashen"):
+        os.makedirs(cache_dir, exist_ok=True)
+        cached = load_cache(cache_dir)
+        usage = None
+        if prune_dir:
+            usage = scan_key_usage(prune_dir, exclude=[output_file] + ([split_dir] if split_dir else []))
+            report_pruned(sources, usage)
+        salt = usage_fingerprint(usage) if usage else ""
+        hashes = {locale: file_hash(path, salt) for locale, path in sources.items()}
+        parts = {locale: os.path.join(cache_dir, locale + ".block") for locale in locales}
+        changed = [locale for locale in locales
+                   if cache_entry(cached, locale).get("hash") != hashes[locale] or not os.path.isfile(parts[locale])]
+
+    with stage(timings, "rendern"):
+        # 'de' zuerst: dessen Schlüssel mit Platzhaltern bestimmen, was die Signaturen der anderen enthalten
+        signatures = {}
+        if REFERENCE_LOCALE in changed:
+            signatures[REFERENCE_LOCALE] = render_block_file(
+                (REFERENCE_LOCALE, sources[REFERENCE_LOCALE], parts[REFERENCE_LOCALE], usage, frozenset()))
+        else:
+            signatures[REFERENCE_LOCALE] = cache_entry(cached, REFERENCE_LOCALE).get("placeholders", {})
+        ref_keys = frozenset(key for key, names in signatures[REFERENCE_LOCALE].items() if names)
+        ref = ref_fingerprint(ref_keys)
+        others = [locale for locale in changed if locale != REFERENCE_LOCALE]
+        work = [(locale, sources[locale], parts[locale], usage, ref_keys) for locale in others]
+        signatures.update(zip(others, render_changed(work, jobs)))
+        for locale in locales:
+            if locale not in signatures:
+                entry = cache_entry(cached, locale)
+                signatures[locale] = (entry["placeholders"] if entry.get("ref") == ref
+                                      else block_signature(parts[locale], ref_keys))
+        index = {locale: {"hash": hashes[locale], "ref": "" if locale == REFERENCE_LOCALE else ref,
+                          "placeholders": signatures[locale]} for locale in locales}
+        if index != cached:
+            save_cache(cache_dir, index)
+
+    with stage(timings, "platzhalter"):
+        problems = check_placeholders(signatures, lambda: scan_block(parts[REFERENCE_LOCALE])[0])
+    if stats:
+        print_locale_stats(locales, parts)
+    if problems and strict:
+        sys.exit(f"{problems} Platzhalter weichen von 'de' ab, nichts geschrieben.")
+
+    with stage(timings, "zusammensetzen"):
+        value_type = "string"
+        keys = None
+        # Volle Einträge nur laden, wenn ein Ausgabeformat sie braucht; sonst werden die Blöcke durchgereicht
+        entries = None
+        if templates or intern or indexed:
+            entries = {locale: block_entries(parts[locale]) for locale in locales}
+        if templates:
+            try:
+                entries = {locale: [(key, compile_template(value, f"{locale}/{key}")) for key, value in values]
+                           for locale, values in entries.items()}
+            except ValueError as error:
+                sys.exit(f"Vorlage nicht kompilierbar: {error}")
+            value_type = "string | string[]"
+        if indexed:
+            # Die bisherigen IDs stehen in der letzten Ausgabe dieses Ziels, nicht im Cache
+            known = read_key_ids(os.path.join(split_dir, "index.ts") if split_dir else output_file)
+            keys, entries = index_entries(locales, entries, known)
+        content = None
+        if split_dir:
+            pass
+        elif entries is None:
+            content = lambda: catalog_chunks(locales, parts)
+        elif intern:
+            text = render_interned(locales, entries, value_type, keys)
+            content = lambda: [text]
+        else:
+            text = render_catalog(locales, entries, value_type, keys)
+            content = lambda: [text]
+
+    with stage(timings, "schreiben"):
+        if split_dir:
+            load = entries.__getitem__ if entries is not None else lambda locale: block_entries(parts[locale])
+            write_split(split_dir, locales, load, value_type, len(changed), keys)
+        elif write_chunks_if_changed(output_file, content):
+            print(f"Datei '{output_file}' erstellt! ({len(changed)} von {len(locales)} Sprachen neu)")
+        else:
+            print(f"Datei '{output_file}' unverändert.")
+
+    if stats:
+        print_timings(timings)
+
+
+def catalog_chunks(locales, parts):
+    # Entspricht render_catalog, reicht die fertigen Blöcke aber unverändert durch
+    yield render_header()
+    yield "export const translations: Record<string, Record<string, string>> = {\n"
+    for locale in locales:
+        yield from block_chunks(parts[locale])
+    yield "};\n"
+
+
+def scan_block(part_path):
+    # Schlüsselmenge und Größe der Eintragszeilen eines Blocks, ohne die Werte zu behalten
+    keys = set()
+    size = 0
+    with open(part_path, encoding="utf-8") as f:
+        for line in f:
+            entry = parse_line(line)
+            if entry and entry[1].endswith(","):
+                keys.add(entry[0])
+                size += len(line.encode())
+    return keys, size
+
+
+def print_locale_stats(locales, parts, reference=REFERENCE_LOCALE):
+    # Fehlende Schlüssel kosten zur Laufzeit jeweils einen Fallback-Lookup auf 'de' in t().
+    # Liest die Blöcke nacheinander; im Speicher bleiben nur die Schlüssel von 'de' und der aktuellen Sprache
+    reference_keys = scan_block(parts[reference])[0]
+    print(f"{'Sprache':<8} {'Schlüssel':>9} {'Bytes':>9} {'fehlend':>8}")
+    for locale in locales:
+        keys, size = scan_block(parts[locale])
+        print(f"{locale:<8} {len(keys):>9} {size:>9} {len(reference_keys - keys):>8}")
+
+
+def print_timings(timings):
+    total = sum(timings.values())
+    for name, seconds in timings.items():
+        print(f"  {name:<14} {seconds * 1000:8.1f} ms")
+    print(f"  {'gesamt':<14} {total * 1000:8.1f} ms")
+
+
+def block_entries(part_path):
+    with open(part_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()[1:-1]
+    return [(key, value.rstrip(",")) for key, value in filter(None, map(parse_line, lines))]
+
+
+def decode_value(value, where):
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        decoded = None
+    if not isinstance(decoded, str):
+        raise ValueError(f"{where}: kein gültiges JSON-String-Literal: {value}")
+    return decoded
+
+
+def placeholders(value):
+    # Direkt auf dem Literal, ohne JSON-Dekodierung; die Anführungszeichen stören die Suche nicht
+    if "{" not in value:
+        return []
+    return sorted(PLACEHOLDER.findall(value))
+
+
+def check_placeholders(signatures, reference_keys, reference=REFERENCE_LOCALE):
+    # Meldet Werte, deren Platzhalter nicht zur Referenzsprache passen (z. B. {nombre} statt {name}).
+    # signatures: Sprache -> {Schlüssel: Platzhalter} aus render_block. Schlüssel, die es in 'de' gar nicht gibt,
+    # werden übersprungen; reference_keys() liest die Schlüssel von 'de' erst, wenn das nötig wird
+    expected = signatures.get(reference, {})
+    known = None
+    problems = 0
+    for locale, signature in signatures.items():
+        if locale == reference:
+            continue
+        for key, found in signature.items():
+            if found != expected.get(key, []):
+                if key not in expected:
+                    if known is None:
+                        known = reference_keys()
+                    if key not in known:
+                        continue
+                wanted = ", ".join(f"{{{name}}}" for name in expected.get(key, [])) or "keine"
+                got = ", ".join(f"{{{name}}}" for name in found) or "keine"
+                print(f"Platzhalter {locale}/{key}: {got} statt {wanted}", file=sys.stderr)
+                problems += 1
+    return problems
+
+
+def compile_template(value, where):
+    # "Noch {count} Rollen" -> ["Noch ", "count", " Rollen"]; ungerade Indizes sind Platzhalter
+    segments = PLACEHOLDER.split(decode_value(value, where))
+    if len(segments) == 1:
+        return value
+    if not segments[-1]:
+        segments.pop()
+    return json.dumps(segments, ensure_ascii=False)
+
+
+def read_key_ids(path):
+    # IDs aus der KEY_IDS-Tabelle einer früheren --indexed-Ausgabe, Position = ID (None für unbekannte Lücken)
+    ids = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            inside = False
+            for line in f:
+                if line.startswith("export const KEY_IDS = {"):
+                    inside = True
+                elif inside:
+                    if line.startswith("}"):
+                        break
+                    match = KEY_ID_LINE.match(line)
+                    if match:
+                        ids[int(match.group(2))] = match.group(1)
+    except (OSError, UnicodeDecodeError):
+        return []
+    return [ids.get(i) for i in range(max(ids) + 1)] if ids else []
+
+
+def index_entries(locales, entries, known=(), reference=REFERENCE_LOCALE):
+    # Dichte Arrays mit stabilen Schlüssel-IDs: bekannte Schlüssel behalten ihre Position aus known,
+    # neue werden sortiert angehängt. Entfernte Schlüssel behalten ihren Platz (Wert ""), damit sich keine
+    # ID verschiebt; keys enthält (Schlüssel, vorhanden). Lücken werden schon hier mit 'de' bzw. dem
+    # Schlüssel gefüllt; leere Werte zählen wie in t() ('||') als fehlend
+    by_locale = {locale: {key: value for key, value in values if value != '""'} for locale, values in entries.items()}
+    present = set().union(*by_locale.values())
+    keys = [(key, key in present) for key in known] + [(key, True) for key in sorted(present.difference(known))]
+    fallback = by_locale.get(reference, {})
+    indexed = {}
+    for locale in locales:
+        values = by_locale[locale]
+        indexed[locale] = [(None, (values.get(key) or fallback.get(key) or json.dumps(key)) if used else '""')
+                           for key, used in keys]
+    return keys, indexed
+
+
+def render_key_ids(keys):
+    # Entfernte Schlüssel bleiben auskommentiert stehen, damit read_key_ids ihre ID beim nächsten Lauf kennt
+    body = "".join(f"  {key}: {i},\n" if used else f"  // {key}: {i}, (entfernt, ID bleibt reserviert)\n"
+                   for i, (key, used) in enumerate(keys) if key is not None)
+    return ("export const KEY_IDS = {\n" + body + "} as const;\n\n"
+            "export type TranslationKey = keyof typeof KEY_IDS;\n\n")
+
+
+def render_entries(values, indent, lookup=None):
+    lines = []
+    for key, value in values:
+        value = lookup.get(value, value) if lookup else value
+        lines.append(f"{indent}{key}: {value},\n" if key is not None else f"{indent}{value},\n")
+    return "".join(lines)
+
+
+def array_type(value_type):
+    return f"({value_type})[]" if "|" in value_type else f"{value_type}[]"
+
+
+def catalog_type(value_type, keys):
+    return array_type(value_type) if keys is not None else f"Record<string, {value_type}>"
+
+
+def render_translations(locales, entries, value_type, keys, lookup=None):
+    open_, close = ("[", "]") if keys is not None else ("{", "}")
+    chunks = [f"export const translations: Record<string, {catalog_type(value_type, keys)}> = {{\n"]
+    for locale in locales:
+        chunks.append(f"  {locale}: {open_}\n")
+        chunks.append(render_entries(entries[locale], "    ", lookup))
+        chunks.append(f"  {close},\n")
+    chunks.append("};\n")
+    return "".join(chunks)
+
+
+def render_catalog(locales, entries, value_type="string", keys=None):
+    key_ids = render_key_ids(keys) if keys is not None else ""
+    return render_header() + key_ids + render_translations(locales, entries, value_type, keys)
+
+
+def render_interned(locales, entries, value_type="string", keys=None):
+    # Werte, die mehrfach vorkommen und länger als eine Referenz sind, landen einmal in S
+    counts = {}
+    for values in entries.values():
+        for _, value in values:
+            counts[value] = counts.get(value, 0) + 1
+    table = {}
+    for value, count in sorted(counts.items(), key=lambda item: -item[1]):
+        if count > 1 and len(value) > len(f"S[{len(table)}]"):
+            table[value] = f"S[{len(table)}]"
+
+    chunks = [render_header(), render_key_ids(keys) if keys is not None else "", f"const S: {array_type(value_type)} = [\n"]
+    chunks.extend(f"  {value},\n" for value in table)
+    chunks.append("];\n\n")
+    chunks.append(render_translations(locales, entries, value_type, keys, table))
+
+    total = sum(counts.values())
+    plain = sum(len(value.encode()) * count for value, count in counts.items())
+    interned = (sum(len(value.encode()) + 4 for value in table)
+                + sum(len(table.get(value, value).encode()) * count for value, count in counts.items()))
+    print(f"Werte: {total} gesamt, {len(counts)} eindeutig, {len(table)} in der Stringtabelle; "
+          f"{(plain - interned) / 1024:.1f} KiB gespart ({plain / 1024:.1f} -> {interned / 1024:.1f} KiB)")
+    return "".join(chunks)
+
+
+def render_module(values, value_type="string", keys=None):
+    open_, close = ("[", "]") if keys is not None else ("{", "}")
+    return (f"const messages: {catalog_type(value_type, keys)} = {open_}\n" + render_entries(values, "  ")
+            + f"{close};\n\nexport default messages;\n")
+
+
+def render_index(locales, value_type="string", keys=None):
+    loaders = "".join(f"  {module_name(locale)}: () => import('./{locale}'),\n" for locale in locales)
+    return (render_header()
+            + (render_key_ids(keys) if keys is not None else "")
+            + f"export type Messages = {catalog_type(value_type, keys)};\n\n"
+            + "export const loaders: Record<string, () => Promise<{ default: Messages }>> = {\n"
+            + loaders + "};\n")
+
+
+def module_name(locale):
+    return locale if locale.isidentifier() else f"'{locale}'"
+
+
+def write_split(split_dir, locales, load, value_type, changed_count, keys=None):
+    # Ein Modul pro Sprache plus index.ts, damit die App nur die aktive Sprache lädt.
+    # load(locale) liefert die Einträge, so liegt ohne --templates/--indexed immer nur eine Sprache im Speicher
+    os.makedirs(split_dir, exist_ok=True)
+    written = 0
+    for locale in locales:
+        module = render_module(load(locale), value_type, keys)
+        written += write_if_changed(os.path.join(split_dir, locale + ".ts"), module)
+    written += write_if_changed(os.path.join(split_dir, "index.ts"), render_index(locales, value_type, keys))
+    print(f"Ordner '{split_dir}': {written} Dateien geschrieben ({changed_count} von {len(locales)} Sprachen neu)")
+
+
+def extract_sources(i18n_file, src_dir):
+    # Zerlegt ein bestehendes src/i18n.ts in eine Quelldatei pro Sprache
+    os.makedirs(src_dir, exist_ok=True)
+    out = None
+    count = 0
+    with open(i18n_file, encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if out is None:
+                if stripped.endswith("{") and ":" in stripped and not stripped.startswith("export"):
+                    locale = stripped.split(":", 1)[0].strip().strip("'\"")
+                    out = open(os.path.join(src_dir, locale + ".json"), "w", encoding="utf-8", newline="\n")
+                    entries = []
+                continue
+            if stripped.startswith("}"):
+                out.write("{\n" + ",\n".join(entries) + "\n}\n")
+                out.close()
+                out = None
+                count += 1
+                continue
+            entry = parse_line(stripped)
+            if entry:
+                key, value = entry
+                entries.append(f'  "{key}": {value.rstrip(",")}')
+    print(f"{count} Quelldateien nach '{src_dir}' geschrieben!")
+
+
+def open_inotify(directory):
+    # Liefert den inotify-fd oder None, wenn inotify nicht verfügbar ist (z. B. macOS/Windows)
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+    except (OSError, AttributeError):
+        return None
+    return fd
+
+
+# wait(timeout) der Waiter liefert None (Zeit abgelaufen), False (Ereignis, aber keine Quelldatei,
+# z. B. die Swap-Datei eines Editors) oder True (Quelldatei geändert)
+def inotify_waiter(fd):
+    def wait(timeout):
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            return None
+        data = os.read(fd, 1 << 16)
+        pos = 0
+        relevant = False
+        while pos < len(data):
+            _, _, _, name_len = struct.unpack_from("iIII", data, pos)
+            name = data[pos + 16:pos + 16 + name_len].rstrip(b"\0").decode("utf-8", "replace")
+            relevant |= name.endswith(SOURCE_EXTENSIONS)
+            pos += 16 + name_len
+        return relevant
+    return wait
+
+
+def source_snapshot(src_dir):
+    snapshot = {}
+    for entry in os.scandir(src_dir):
+        if entry.name.endswith(SOURCE_EXTENSIONS):
+            stat = entry.stat()
+            snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def polling_waiter(src_dir):
+    state = {"snapshot": source_snapshot(src_dir)}
+
+    def wait(timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            snapshot = source_snapshot(src_dir)
+            if snapshot != state["snapshot"]:
+                state["snapshot"] = snapshot
+                return True
+        return None
+    return wait
+
+
+def watch(src_dir, regenerate, debounce=WATCH_DEBOUNCE):
+    # Langlebiger Prozess: bei Änderungen in src_dir einmal pro Speicher-Serie neu erzeugen
+    fd = open_inotify(src_dir)
+    wait = inotify_waiter(fd) if fd is not None else polling_waiter(src_dir)
+    print(f"Beobachte '{src_dir}' ({'inotify' if fd is not None else 'Polling'}), Abbruch mit Strg+C")
+
+    def run():
+        start = time.perf_counter()
+        try:
+            regenerate()
+        except (SystemExit, Exception) as error:
+            # Fehler in einer Quelldatei (z. B. ungültiges UTF-8) sollen den Watcher nicht beenden
+            print(f"Fehler: {error}", file=sys.stderr)
+        print(f"  ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    run()
+    try:
+        while True:
+            relevant = wait(None)
+            # Jedes Ereignis hält das Fenster offen, auch Temp-/Swap-Dateien, die Editoren vor dem
+            # Umbenennen schreiben; neu erzeugt wird nur, wenn dabei eine Quelldatei betroffen war
+            event = relevant
+            while event is not None:
+                event = wait(debounce)
+                relevant = relevant or bool(event)
+            if relevant:
+                run()
+    except KeyboardInterrupt:
+        print("Beendet.")
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Formatiert Übersetzungen für src/i18n.ts")
+    parser.add_argument("--src", help="Ordner mit einer Quelldatei pro Sprache (<code>.json)")
+    parser.add_argument("--out", default=APP_CATALOG, help="Zieldatei für den Batch-Modus")
+    parser.add_argument("--split", metavar="DIR", help="Statt --out ein Modul pro Sprache nach DIR schreiben (z. B. src/locales)")
+    parser.add_argument("--prune", metavar="SRC_DIR", help="Schlüssel entfernen, die in SRC_DIR (z. B. src) nicht vorkommen")
+    parser.add_argument("--intern", action="store_true", help="Mehrfach vorkommende Werte über eine gemeinsame Stringtabelle ausgeben")
+    parser.add_argument("--templates", action="store_true", help="Werte mit Platzhaltern als vorkompilierte Segmentlisten ausgeben")
+    parser.add_argument("--indexed", action="store_true", help="Schlüssel-ID-Tabelle plus ein dichtes Array pro Sprache ausgeben")
+    parser.add_argument("--strict", action="store_true", help="Abbrechen, wenn Platzhalter von 'de' abweichen")
+    parser.add_argument("--stats", action="store_true", help="Zeiten pro Stufe sowie Schlüssel, Bytes und Lücken pro Sprache ausgeben")
+    parser.add_argument("--profile", action="store_true", help="Wie --stats, zusätzlich cProfile-Auswertung der teuersten Funktionen")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prozesse")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="Ordner für Hashes und gerenderte Blöcke")
+    parser.add_argument("--watch", action="store_true", help="--src beobachten und bei Änderungen neu erzeugen")
+    parser.add_argument("--extract", metavar="I18N_TS", help="Bestehende i18n.ts in --src zerlegen")
+    args = parser.parse_args(argv)
+    if args.intern and args.split:
+        parser.error("--intern ist nur mit --out möglich, eine gemeinsame Tabelle würde das Aufteilen aufheben")
+    if args.indexed and not args.split and os.path.abspath(args.out) == os.path.abspath(APP_CATALOG):
+        parser.error(f"--indexed erzeugt Arrays statt Objekten, t() liest {APP_CATALOG} aber per Schlüssel; "
+                     "bitte ein anderes --out oder --split angeben")
+
+    def regenerate():
+        generate_all(args.src, args.out, jobs=args.jobs, cache_dir=args.cache, split_dir=args.split,
+                     prune_dir=args.prune, intern=args.intern, templates=args.templates, strict=args.strict,
+                     indexed=args.indexed, stats=args.stats or args.profile)
+
+    if args.extract:
+        if not args.src:
+            parser.error("--extract benötigt --src")
+        extract_sources(args.extract, args.src)
+    elif args.src and args.watch:
+        watch(args.src, regenerate)
+    elif args.src and args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(regenerate)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    elif args.src:
+        regenerate()
+    else:
+        output_file = "output.txt"
+        format_text_and_save(text, output_file)
+
+
 if __name__ == "__main__":
-    output_file = "output.txt"
-    format_text_and_save(text, output_file)
\ No newline at end of file
+    main()
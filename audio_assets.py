@@ -0,0 +1,99 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_manifest import DEFAULT_AUDIO_DIR, HASH_LENGTH, list_clips
+
+DEFAULT_ASSET_DIR = "public/audio-hashed"
+DEFAULT_MAP = "src/audioAssets.ts"
+
+# App-Sprachcodes, deren Clips in einem anders benannten Ordner liegen.
+# 'emoji' nutzt die deutschen Texte und bekommt daher die deutschen Clips.
+AUDIO_ALIASES = {"no": "nb", "zh-CN": "zh", "emoji": "de"}
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:HASH_LENGTH]
+
+
+def store_assets(clips, digests, asset_dir):
+    # Jede Nutzlast genau einmal unter ihrem Hash ablegen; vorhandene Dateien sind unveränderlich
+    os.makedirs(asset_dir, exist_ok=True)
+    stored = {}
+    copied = 0
+    for (_, _, path), digest in zip(clips, digests):
+        if digest in stored:
+            continue
+        name = digest + ".mp3"
+        target = os.path.join(asset_dir, name)
+        if not os.path.exists(target):
+            shutil.copyfile(path, target + ".tmp")
+            os.replace(target + ".tmp", target)
+            copied += 1
+        stored[digest] = name
+    return stored, copied
+
+
+def remove_stale(asset_dir, keep):
+    removed = 0
+    for name in os.listdir(asset_dir):
+        if name.endswith(".mp3") and name not in keep:
+            os.unlink(os.path.join(asset_dir, name))
+            removed += 1
+    return removed
+
+
+def render_map(files, url_prefix):
+    lines = [f"  {json.dumps(locale)}: {json.dumps(keys, separators=(',', ':'), sort_keys=True)},"
+             for locale, keys in sorted(files.items())]
+    aliases = ", ".join(f"{json.dumps(code)}: {json.dumps(target)}" for code, target in AUDIO_ALIASES.items())
+    return (f"export const audioAliases: Record<string, string> = {{ {aliases} }};\n\n"
+            "export const audioFiles: Record<string, Record<string, string>> = {\n"
+            + "\n".join(lines) + "\n};\n\n"
+            "export const audioUrl = (locale: string, textKey: string): string | undefined => {\n"
+            "  const file = audioFiles[audioAliases[locale] ?? locale]?.[textKey];\n"
+            f"  return file ? {json.dumps(url_prefix)} + file : undefined;\n"
+            "};\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Legt Erzähler-Clips inhaltsadressiert unter unveränderlichen Namen ab")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO_DIR, help="Ordner mit einem Unterordner pro Sprache")
+    parser.add_argument("--out", default=DEFAULT_ASSET_DIR, help="Zielordner für <hash>.mp3")
+    parser.add_argument("--map", default=DEFAULT_MAP, help="Zieldatei für die Zuordnung Sprache -> Schlüssel -> Datei")
+    parser.add_argument("--url-prefix", default="/audio-hashed/", help="URL-Präfix der Dateien in der App")
+    parser.add_argument("--prune", action="store_true", help="Nicht mehr referenzierte Dateien im Zielordner löschen")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prozesse")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    clips = list_clips(args.audio)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        digests = list(pool.map(hash_file, [path for _, _, path in clips], chunksize=32))
+
+    stored, copied = store_assets(clips, digests, args.out)
+    files = {}
+    for (locale, key, _), digest in zip(clips, digests):
+        files.setdefault(locale, {})[key] = stored[digest]
+    with open(args.map, "w", encoding="utf-8", newline="\n") as f:
+        f.write(render_map(files, args.url_prefix))
+    removed = remove_stale(args.out, set(stored.values())) if args.prune else 0
+
+    total_bytes = sum(os.path.getsize(path) for _, _, path in clips)
+    unique_bytes = sum(os.path.getsize(os.path.join(args.out, name)) for name in stored.values())
+    elapsed = time.perf_counter() - start
+    print(f"{len(clips)} Clips, {len(stored)} eindeutig ({(total_bytes - unique_bytes) / 1e6:.1f} MB gespart), "
+          f"{copied} neu kopiert, {removed} entfernt ({elapsed:.2f} s)")
+    print(f"Datei '{args.map}' erstellt!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Bitraten in kbit/s je (MPEG-Version, Layer); Index 0 = "free", 15 = ungültig
+BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 25: (11025, 12000, 8000)}
+VERSIONS = {0b00: 25, 0b10: 2, 0b11: 1}
+LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+DEFAULT_AUDIO_DIR = "public/audio"
+DEFAULT_OUTPUT = "src/audioManifest.ts"
+HASH_LENGTH = 16
+
+
+def parse_header(data, pos):
+    # Liefert (Framelänge, Samples, Samplerate, Header-Bytes) oder None, wenn an pos kein gültiger Frame beginnt
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = VERSIONS.get((b1 >> 3) & 0b11)
+    layer = LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0b11
+    if not version or not layer or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = BITRATES[(min(version, 2), layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, b3
+    samples = 1152 if layer == 2 or version == 1 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate, b3
+
+
+def is_info_frame(data, pos, version, channel_mode, protected):
+    # Xing-/Info-/VBRI-Frames enthalten nur Metadaten und werden nicht abgespielt
+    if version == 1:
+        side_info = 17 if channel_mode == 3 else 32
+    else:
+        side_info = 9 if channel_mode == 3 else 17
+    tag = pos + 4 + (2 if protected else 0) + side_info
+    return data[tag:tag + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def skip_id3v2(data):
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def iter_frames(data):
+    # Liefert (Offset, Länge, Samples, Samplerate) für jeden Audio-Frame, ohne zu dekodieren
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+    pos = skip_id3v2(data)
+    first = True
+    while pos + 4 <= end:
+        header = parse_header(data, pos)
+        if not header or pos + header[0] > end:
+            # Resync: bis zum nächsten Sync-Wort weitersuchen
+            pos = data.find(b"\xff", pos + 1, end)
+            if pos < 0:
+                break
+            continue
+        length, samples, sample_rate, b3 = header
+        if first:
+            first = False
+            version = VERSIONS[(data[pos + 1] >> 3) & 0b11]
+            protected = not data[pos + 1] & 1
+            if is_info_frame(data, pos, version, b3 >> 6, protected):
+                pos += length
+                continue
+        yield pos, length, samples, sample_rate
+        pos += length
+
+
+def scan_clip(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    samples = 0
+    sample_rate = 0
+    frames = 0
+    for _, _, frame_samples, sample_rate in iter_frames(data):
+        samples += frame_samples
+        frames += 1
+    duration_ms = round(samples * 1000 / sample_rate) if sample_rate else 0
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return path, duration_ms, len(data), digest, frames
+
+
+def list_clips(audio_dir):
+    clips = []
+    for locale in sorted(os.listdir(audio_dir)):
+        locale_dir = os.path.join(audio_dir, locale)
+        if not os.path.isdir(locale_dir):
+            continue
+        for name in sorted(os.listdir(locale_dir)):
+            if name.endswith(".mp3"):
+                clips.append((locale, name[:-4], os.path.join(locale_dir, name)))
+    return clips
+
+
+def build_manifest(audio_dir, jobs=None):
+    clips = list_clips(audio_dir)
+    manifest = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(scan_clip, [path for _, _, path in clips], chunksize=32)
+        for (locale, key, _), (path, duration_ms, size, digest, frames) in zip(clips, results):
+            if not frames:
+                print(f"Warnung: keine MPEG-Frames in '{path}'", file=sys.stderr)
+            manifest.setdefault(locale, {})[key] = [duration_ms, size, digest]
+    return manifest
+
+
+def report_missing(manifest):
+    # Schlüssel, die in mindestens einer Sprache vorhanden sind, in anderen aber fehlen
+    all_keys = set().union(*manifest.values()) if manifest else set()
+    missing = 0
+    for locale, clips in manifest.items():
+        for key in sorted(all_keys - clips.keys()):
+            print(f"Fehlt: {locale}/{key}.mp3", file=sys.stderr)
+            missing += 1
+    return missing
+
+
+def render_manifest(manifest):
+    lines = [f"  {json.dumps(locale)}: {json.dumps(clips, separators=(',', ':'), sort_keys=True)},"
+             for locale, clips in sorted(manifest.items())]
+    return ("// Spalten: [durationMs, bytes, hash]\n"
+            "export type AudioClipInfo = [number, number, string];\n\n"
+            "export const audioManifest: Record<string, Record<string, AudioClipInfo>> = {\n"
+            + "\n".join(lines) + "\n};\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Erzeugt ein Manifest mit Dauer, Größe und Hash aller Erzähler-Clips")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO_DIR, help="Ordner mit einem Unterordner pro Sprache")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help="Zieldatei für das Manifest")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prozesse")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest = build_manifest(args.audio, args.jobs)
+    missing = report_missing(manifest)
+    with open(args.out, "w", encoding="utf-8", newline="\n") as f:
+        f.write(render_manifest(manifest))
+
+    clips = sum(len(clips) for clips in manifest.values())
+    elapsed = time.perf_counter() - start
+    print(f"Datei '{args.out}' erstellt! ({clips} Clips in {len(manifest)} Sprachen, "
+          f"{missing} fehlend, {elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_manifest import DEFAULT_AUDIO_DIR, iter_frames, list_clips
+
+DEFAULT_SPRITE_DIR = "public/audio-sprites"
+DEFAULT_INDEX = "src/audioSprites.ts"
+
+
+def frame_runs(data):
+    # Fasst direkt aufeinanderfolgende Frames zu (Start, Ende)-Bereichen zusammen
+    runs = []
+    samples = 0
+    sample_rate = 0
+    for offset, length, frame_samples, sample_rate in iter_frames(data):
+        if runs and runs[-1][1] == offset:
+            runs[-1][1] = offset + length
+        else:
+            runs.append([offset, offset + length])
+        samples += frame_samples
+    return runs, samples, sample_rate
+
+
+def pack_locale(job):
+    # Hängt die Frames aller Clips einer Sprache ohne Neukodierung hintereinander
+    locale, clips, sprite_path = job
+    index = {}
+    byte_pos = 0
+    sample_pos = 0
+    sprite_rate = None
+    tmp_path = sprite_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        for key, path in clips:
+            if not os.path.getsize(path):
+                print(f"Warnung: leere Datei '{path}'", file=sys.stderr)
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                runs, samples, sample_rate = frame_runs(mm)
+                if not samples:
+                    print(f"Warnung: keine MPEG-Frames in '{path}'", file=sys.stderr)
+                    continue
+                if sprite_rate is None:
+                    sprite_rate = sample_rate
+                elif sample_rate != sprite_rate:
+                    os.unlink(tmp_path)
+                    raise ValueError(f"'{path}' hat {sample_rate} Hz, Sprite '{locale}' aber {sprite_rate} Hz")
+                start = byte_pos
+                view = memoryview(mm)
+                for run_start, run_end in runs:
+                    out.write(view[run_start:run_end])
+                    byte_pos += run_end - run_start
+                view.release()
+            start_ms = round(sample_pos * 1000 / sprite_rate)
+            sample_pos += samples
+            end_ms = round(sample_pos * 1000 / sprite_rate)
+            index[key] = [start_ms, end_ms - start_ms, start, byte_pos - start]
+    os.replace(tmp_path, sprite_path)
+    return locale, index, byte_pos
+
+
+def render_index(sprites, url_prefix):
+    lines = [f"  {json.dumps(locale)}: {{ url: {json.dumps(url_prefix + locale + '.mp3')}, "
+             f"clips: {json.dumps(clips, separators=(',', ':'), sort_keys=True)} }},"
+             for locale, clips in sorted(sprites.items())]
+    return ("// Spalten: [startMs, durationMs, byteOffset, byteLength]\n"
+            "export type AudioSpriteClip = [number, number, number, number];\n\n"
+            "export const audioSprites: Record<string, { url: string; clips: Record<string, AudioSpriteClip> }> = {\n"
+            + "\n".join(lines) + "\n};\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Packt alle Erzähler-Clips einer Sprache in eine Sprite-Datei")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO_DIR, help="Ordner mit einem Unterordner pro Sprache")
+    parser.add_argument("--out", default=DEFAULT_SPRITE_DIR, help="Zielordner für <locale>.mp3")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="Zieldatei für den Offset-Index")
+    parser.add_argument("--url-prefix", default="/audio-sprites/", help="URL-Präfix der Sprites in der App")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prozesse")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    os.makedirs(args.out, exist_ok=True)
+    by_locale = {}
+    for locale, key, path in list_clips(args.audio):
+        by_locale.setdefault(locale, []).append((key, path))
+    work = [(locale, clips, os.path.join(args.out, locale + ".mp3")) for locale, clips in by_locale.items()]
+
+    sprites = {}
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for locale, index, size in pool.map(pack_locale, work):
+            sprites[locale] = index
+            total += size
+
+    with open(args.index, "w", encoding="utf-8", newline="\n") as f:
+        f.write(render_index(sprites, args.url_prefix))
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(sprites)} Sprites nach '{args.out}' geschrieben ({total / 1e6:.1f} MB, {elapsed:.2f} s), "
+          f"Index in '{args.index}'")
+
+
+if __name__ == "__main__":
+    main()
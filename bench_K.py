@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from K import LANGUAGES, locale_key
+
+DEFAULT_SIZES = (300, 3000, 30000, 100000)
+FULL_SIZES = DEFAULT_SIZES + (300000, 1000000)
+DEFAULT_OUTPUT = "bench_output.txt"
+SEED = 2011
+
+WORDS = ("Werwolf", "Dorf", "Nacht", "Hexe", "Seherin", "Amor", "Jäger", "Rolle", "Spieler", "Abstimmung",
+         "wählt", "öffnet", "schließt", "Augen", "🐺", "🌙", "💀", "🎭", "⚖️", "👩‍🌾")
+
+# Führt generate_all in einem frischen Prozess aus und meldet Laufzeit und Spitzen-RSS (inkl. Pool-Prozesse)
+RUNNER = """
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+from K import generate_all
+start = time.perf_counter()
+generate_all(sys.argv[2], sys.argv[3], cache_dir=sys.argv[4])
+elapsed = time.perf_counter() - start
+own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kib": own, "worker_rss_kib": children}))
+"""
+
+
+def write_catalog(src_dir, size, rng):
+    # Synthetische Quelldateien: ~1 % Platzhalter, ~2 % fehlende Schlüssel außerhalb von 'de'
+    os.makedirs(src_dir, exist_ok=True)
+    for code, _, _ in LANGUAGES:
+        locale = locale_key(code)
+        with open(os.path.join(src_dir, locale + ".json"), "w", encoding="utf-8", newline="\n") as f:
+            f.write("{\n")
+            for i in range(size):
+                if locale != "de" and rng.random() < 0.02:
+                    continue
+                words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 12)))
+                if rng.random() < 0.01:
+                    words += " {count}"
+                f.write(f"  {json.dumps(f'key_{i:07d}')}: {json.dumps(words, ensure_ascii=False)},\n")
+            f.write("}\n")
+
+
+def touch_one(src_dir, rng):
+    # Simuliert eine typische Ein-Schlüssel-Änderung in einer Sprache: neuer Wert für einen vorhandenen Schlüssel
+    path = os.path.join(src_dir, "en.json")
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    entries = [i for i, line in enumerate(lines) if line.startswith('  "')]
+    i = rng.choice(entries)
+    key = lines[i].split(":", 1)[0]
+    lines[i] = f"{key}: {json.dumps(f'bench edit {rng.random()}')},\n"
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.writelines(lines)
+
+
+def run(src_dir, output_file, cache_dir):
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-c", RUNNER, here, src_dir, output_file, cache_dir],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_size(size, work_dir):
+    rng = random.Random(SEED + size)
+    src_dir = os.path.join(work_dir, f"src-{size}")
+    output_file = os.path.join(work_dir, f"i18n-{size}.ts")
+    cache_dir = os.path.join(work_dir, f"cache-{size}")
+    write_catalog(src_dir, size, rng)
+    source_bytes = sum(os.path.getsize(os.path.join(src_dir, name)) for name in os.listdir(src_dir))
+
+    cold = run(src_dir, output_file, cache_dir)
+    warm = run(src_dir, output_file, cache_dir)
+    touch_one(src_dir, rng)
+    edit = run(src_dir, output_file, cache_dir)
+
+    keys = size * len(LANGUAGES)
+    return {
+        "keys_per_locale": size,
+        "source_mb": source_bytes / 1e6,
+        "cold_s": cold["seconds"],
+        "warm_s": warm["seconds"],
+        "edit_s": edit["seconds"],
+        "keys_per_s": keys / cold["seconds"],
+        "mb_per_s": source_bytes / 1e6 / cold["seconds"],
+        "peak_rss_mib": cold["rss_kib"] / 1024,
+        "worker_rss_mib": cold["worker_rss_kib"] / 1024,
+    }
+
+
+def format_row(row):
+    return (f"{row['keys_per_locale']:>9} {row['source_mb']:>9.1f} {row['cold_s']:>8.3f} {row['warm_s']:>8.3f} "
+            f"{row['edit_s']:>8.3f} {row['keys_per_s']:>11.0f} {row['mb_per_s']:>7.1f} "
+            f"{row['peak_rss_mib']:>8.1f} {row['worker_rss_mib']:>8.1f}")
+
+
+HEADER = (f"{'Schlüssel':>9} {'Quelle MB':>9} {'kalt s':>8} {'warm s':>8} {'Edit s':>8} "
+          f"{'Schlüssel/s':>11} {'MB/s':>7} {'RSS MiB':>8} {'Worker':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark für K.py mit synthetischen Katalogen über alle Sprachen")
+    parser.add_argument("--sizes", help="Kommagetrennte Schlüsselanzahl pro Sprache, z. B. 300,3000")
+    parser.add_argument("--full", action="store_true", help="Zusätzlich 300000 und 1000000 Schlüssel (mehrere GB)")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help="Ergebnisse als JSON-Zeilen hier anhängen (Verlauf über Läufe)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else (FULL_SIZES if args.full else DEFAULT_SIZES)
+    print(f"{len(LANGUAGES)} Sprachen, Seed {SEED}")
+    print(HEADER)
+    with tempfile.TemporaryDirectory(prefix="bench-K-") as work_dir, open(args.out, "a", encoding="utf-8") as out:
+        for size in sizes:
+            row = bench_size(size, work_dir)
+            row["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            print(format_row(row), flush=True)
+            out.write(json.dumps(row) + "\n")
+    print(f"Ergebnisse in '{args.out}' gespeichert.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import re
+import sys
+
+from audio_assets import AUDIO_ALIASES
+from audio_manifest import DEFAULT_AUDIO_DIR, list_clips
+from K import LANGUAGES, locale_key
+
+DEFAULT_CONSTANTS = "src/constants.ts"
+DEFAULT_NARRATOR = "src/services/NarratorSystem.ts"
+DEFAULT_OUTPUT = "src/nightPrefetch.ts"
+
+ROUNDS = {"round1": "generateRound1Sequence", "round2plus": "generateRound2PlusSequence"}
+
+ROLE_ID = re.compile(r"\{\s*id:\s*'([^']+)'")
+ROLE_ORDER_ENTRY = re.compile(r"\{\s*id:\s*'([^']+)',\s*texts:\s*\[([^\]]*)\]([^}]*)\}")
+FIXED_SEQUENCE = re.compile(r"roleId:\s*'([^']+)',[^}]*?textSequence:\s*\[([^\]]*)\]", re.S)
+STRING = re.compile(r"'([^']*)'")
+METHOD = re.compile(r"static\s+(\w+)\s*\(")
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def method_bodies(code):
+    # Schneidet den Quelltext an den "static name(" Deklarationen in Methodenabschnitte
+    matches = list(METHOD.finditer(code))
+    return {m.group(1): code[m.end():matches[i + 1].start() if i + 1 < len(matches) else len(code)]
+            for i, m in enumerate(matches)}
+
+
+def parse_round(body):
+    # Liefert die Reihenfolge als Liste von (roleId, [Audio-Schlüssel], onlyEven)
+    steps = []
+    for match in FIXED_SEQUENCE.finditer(body):
+        steps.append((match.start(), match.group(1), STRING.findall(match.group(2)), False))
+    for match in ROLE_ORDER_ENTRY.finditer(body):
+        only_even = re.search(r"onlyEven:\s*true", match.group(3)) is not None
+        steps.append((match.start(), match.group(1), STRING.findall(match.group(2)), only_even))
+    # Die Rollenliste steht im Quelltext vor der Schleife, die sie zwischen close_eyes und open_eyes einfügt
+    fixed = [step for step in steps if step[1] in ("reine_seele", "close_eyes")]
+    closing = [step for step in steps if step[1] == "open_eyes"]
+    roles = [step for step in steps if step[1] not in ("reine_seele", "close_eyes", "open_eyes")]
+    return [step[1:] for step in sorted(fixed) + sorted(roles) + sorted(closing)]
+
+
+def resolve_key(key, round_name, available):
+    # narrator_hexe_action gibt es als _round1 / _round2plus
+    if key in available:
+        return key
+    variant = f"{key}_{round_name}"
+    return variant if variant in available else key
+
+
+def build_plans(narrator_file, available):
+    bodies = method_bodies(read(narrator_file))
+    plans = {}
+    for round_name, method in ROUNDS.items():
+        if method not in bodies:
+            sys.exit(f"'{method}' nicht in '{narrator_file}' gefunden")
+        plans[round_name] = [(role_id, [resolve_key(key, round_name, available) for key in keys], only_even)
+                             for role_id, keys, only_even in parse_round(bodies[method])]
+    return plans
+
+
+def audio_locales(clips_by_locale):
+    # App-Sprachen aus LANGUAGES -> Audio-Ordner, aufgelöst über AUDIO_ALIASES (None = kein Ordner)
+    resolved = {}
+    for code, _, _ in LANGUAGES:
+        locale = locale_key(code)
+        folder = AUDIO_ALIASES.get(code) or AUDIO_ALIASES.get(locale) or locale
+        resolved[locale] = folder if folder in clips_by_locale else None
+    return resolved
+
+
+def check_plans(plans, role_ids, clips_by_locale):
+    problems = 0
+    locales = audio_locales(clips_by_locale)
+    for locale, folder in locales.items():
+        if folder is None:
+            print(f"Keine Audio-Dateien für Sprache '{locale}'", file=sys.stderr)
+            problems += 1
+        elif folder != locale:
+            print(f"Hinweis: '{locale}' hat keinen eigenen Ordner, Clips aus '{folder}' nur über audioUrl() (Alias)", file=sys.stderr)
+    for round_name, steps in plans.items():
+        for role_id, keys, _ in steps:
+            if role_id not in role_ids and role_id not in ("reine_seele", "close_eyes", "open_eyes"):
+                print(f"Unbekannte Rolle in {round_name}: {role_id}", file=sys.stderr)
+                problems += 1
+            for locale, folder in locales.items():
+                if folder is None:
+                    continue
+                for key in keys:
+                    if key not in clips_by_locale[folder]:
+                        print(f"Fehlt: {folder}/{key}.mp3 für '{locale}' ({round_name}, {role_id})", file=sys.stderr)
+                        problems += 1
+    return problems
+
+
+def ts_list(values):
+    return "[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def render_plans(plans):
+    rounds = []
+    for round_name, steps in plans.items():
+        lines = [f"    {{ roleId: '{role_id}', keys: {ts_list(keys)}"
+                 + (", onlyEven: true" if only_even else "") + " },"
+                 for role_id, keys, only_even in steps]
+        rounds.append(f"  {round_name}: [\n" + "\n".join(lines) + "\n  ],")
+    return ("export interface PrefetchStep {\n"
+            "  roleId: string;\n"
+            "  keys: string[];\n"
+            "  onlyEven?: boolean;\n"
+            "}\n\n"
+            "export const nightPrefetch: Record<'round1' | 'round2plus', PrefetchStep[]> = {\n"
+            + "\n".join(rounds) + "\n};\n\n"
+            "// Alle Audio-Schlüssel einer Nacht in Abspielreihenfolge für die vorhandenen Rollen\n"
+            "export const nightAudioKeys = (round: number, roleIds: string[]): string[] => {\n"
+            "  return nightPrefetch[round === 1 ? 'round1' : 'round2plus']\n"
+            "    .filter((step) => !(step.onlyEven && round % 2 !== 0))\n"
+            "    .filter((step) => step.roleId === 'close_eyes' || step.roleId === 'open_eyes' || roleIds.includes(step.roleId))\n"
+            "    .flatMap((step) => step.keys);\n"
+            "};\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Erzeugt Prefetch-Pläne der Nachtphase aus NarratorSystem.ts")
+    parser.add_argument("--constants", default=DEFAULT_CONSTANTS, help="Pfad zu constants.ts")
+    parser.add_argument("--narrator", default=DEFAULT_NARRATOR, help="Pfad zu NarratorSystem.ts")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO_DIR, help="Ordner mit einem Unterordner pro Sprache")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help="Zieldatei für die Prefetch-Pläne")
+    args = parser.parse_args(argv)
+
+    role_ids = set(ROLE_ID.findall(read(args.constants)))
+    clips_by_locale = {}
+    for locale, key, _ in list_clips(args.audio):
+        clips_by_locale.setdefault(locale, set()).add(key)
+    available = set().union(*clips_by_locale.values()) if clips_by_locale else set()
+
+    plans = build_plans(args.narrator, available)
+    problems = check_plans(plans, role_ids, clips_by_locale)
+    with open(args.out, "w", encoding="utf-8", newline="\n") as f:
+        f.write(render_plans(plans))
+
+    steps = sum(len(steps) for steps in plans.values())
+    print(f"Datei '{args.out}' erstellt! ({steps} Schritte, {problems} Probleme)")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
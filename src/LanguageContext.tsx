@@ -15,7 +15,12 @@ export const LanguageProvider: React.FC<{ children: ReactNode }> = ({ children }
   const [locale, setLocale] = useState<Locale>('de');
 
   const t = (key: string, replacements?: Record<string, string | number>): string => {
-    let translation = translations[locale]?.[key] || translations['de']?.[key] || key;
+    const entry: string | string[] = translations[locale]?.[key] || translations['de']?.[key] || key;
+    if (Array.isArray(entry)) {
+        // Vorkompilierte Vorlage aus K.py --templates: ungerade Indizes sind Platzhalter
+        return entry.map((segment, i) => (i % 2 === 1 ? String(replacements?.[segment] ?? `{${segment}}`) : segment)).join('');
+    }
+    let translation = entry;
     if (replacements) {
         Object.entries(replacements).forEach(([keyToReplace, value]) => {
             translation = translation.replace(`{${keyToReplace}}`, String(value));